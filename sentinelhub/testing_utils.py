@@ -4,15 +4,21 @@ Utility tools for writing unit tests for packages which rely on `sentinelhub-py`
 
 import unittest
 import os
+import glob
 import shutil
 import logging
 import inspect
+import threading
+import uuid
 
 import numpy as np
 
 from .config import SHConfig
 
 
+LOGGER = logging.getLogger(__name__)
+
+
 class TestSentinelHub(unittest.TestCase):
     """ Class implementing common functionalities of unit tests for working with `sentinelhub-py` package:
 
@@ -43,6 +49,9 @@ class TestSentinelHub(unittest.TestCase):
         cls.INPUT_FOLDER = os.path.join(os.path.dirname(inspect.getsourcefile(cls)), 'TestInputs')
         cls.OUTPUT_FOLDER = os.path.join(os.path.dirname(inspect.getsourcefile(cls)), 'TestOutputs')
 
+        for stale_folder in glob.glob('{}_{}'.format(glob.escape(cls.OUTPUT_FOLDER), '[0-9a-f]' * 32)):
+            cls._remove_folder(stale_folder)
+
         if cls.CONFIG is None:
             cls.CONFIG = cls._config_with_environment_variables()
 
@@ -65,8 +74,35 @@ class TestSentinelHub(unittest.TestCase):
 
     @classmethod
     def tearDownClass(cls):
-        if cls.CLEAR_OUTPUTS and cls.OUTPUT_FOLDER:
-            shutil.rmtree(cls.OUTPUT_FOLDER, ignore_errors=True)
+        """ Removes the output folder in a background thread
+
+        The folder is first renamed so that the next test class can immediately start using the original location
+        """
+        if not (cls.CLEAR_OUTPUTS and cls.OUTPUT_FOLDER and os.path.exists(cls.OUTPUT_FOLDER)):
+            return
+
+        removed_folder = '{}_{}'.format(cls.OUTPUT_FOLDER, uuid.uuid4().hex)
+        try:
+            os.rename(cls.OUTPUT_FOLDER, removed_folder)
+        except OSError:
+            cls._remove_folder(cls.OUTPUT_FOLDER)
+            return
+
+        threading.Thread(target=cls._remove_folder, args=(removed_folder,)).start()
+
+    @staticmethod
+    def _remove_folder(folder):
+        """ Removes a folder and logs any file or folder which could not be removed. Folders left over from an
+        interrupted removal are removed again in the next ``setUpClass``
+
+        :param folder: Path to a folder
+        :type folder: str
+        """
+        def log_error(_, path, exc_info):
+            if not issubclass(exc_info[0], FileNotFoundError):
+                LOGGER.warning('Failed to remove %s: %s', path, exc_info[1])
+
+        shutil.rmtree(folder, onerror=log_error)
 
     def test_numpy_data(self, data=None, exp_shape=None, exp_dtype=None, exp_min=None, exp_max=None, exp_mean=None,
                         exp_median=None, delta=None, test_name=''):
@@ -102,14 +138,29 @@ class TestSentinelHub(unittest.TestCase):
                     self.assertEqual(stat_val, exp_stat,
                                      msg='Expected {} {}, got {}'.format(stat_name, exp_stat, stat_val))
 
-        for exp_stat, stat_func, stat_name in [(exp_min, np.amin, 'min'), (exp_max, np.amax, 'max'),
-                                               (exp_mean, np.mean, 'mean'), (exp_median, np.median, 'median')]:
+        for exp_stat, stat_func, stat_name in [(exp_min, np.ndarray.min, 'min'), (exp_max, np.ndarray.max, 'max'),
+                                               (exp_mean, self._mean, 'mean'),
+                                               (exp_median, np.median, 'median')]:
             if exp_stat is not None:
                 stat_val = stat_func(data)
                 with self.subTest(msg='Test case {}'.format(test_name)):
                     self.assertAlmostEqual(stat_val, exp_stat, delta=delta,
                                            msg='Expected {} {}, got {}'.format(stat_name, exp_stat, stat_val))
 
+    @staticmethod
+    def _mean(data):
+        """ Calculates mean value of data array. Integer data narrower than 64 bits is summed with an int64 accumulator
+        instead of being converted to float64
+
+        :param data: Data array
+        :type data: numpy.ndarray
+        :return: Mean value
+        :rtype: float
+        """
+        if np.issubdtype(data.dtype, np.integer) and data.dtype.itemsize < 8:
+            return data.sum(dtype=np.int64) / data.size
+        return data.mean()
+
 
 class TestCaseContainer:
     """ Class for storing expected statistics for a single test case
@@ -8,7 +8,7 @@ from sentinelhub import WcsRequest, AwsProductRequest, BBox, CRS, get_file_list,
 class TestDataRequest(TestSentinelHub):
 
     @classmethod
-    def setUp(cls):
+    def setUpClass(cls):
         super().setUpClass()
 
         bbox = BBox((111.7, 8.655, 111.6, 8.688), crs=CRS.WGS84)
@@ -1,5 +1,6 @@
 import unittest
 import datetime
+import concurrent.futures
 import numpy as np
 
 from shapely.geometry import MultiPolygon
@@ -10,6 +11,9 @@ from sentinelhub.data_request import OgcRequest
 from sentinelhub.ogc import OgcImageService
 
 
+WGS84_BBOX = BBox(bbox=(-5.23, 48.0, -5.03, 48.17), crs=CRS.WGS84)
+
+
 class TestOgc(TestSentinelHub):
 
     class OgcTestCase(TestCaseContainer):
@@ -35,7 +39,6 @@ class TestOgc(TestSentinelHub):
     def setUpClass(cls):
         super().setUpClass()
 
-        wgs84_bbox = BBox(bbox=(-5.23, 48.0, -5.03, 48.17), crs=CRS.WGS84)
         wgs84_bbox_2 = BBox(bbox=(21.3, 64.0, 22.0, 64.5), crs=CRS.WGS84)
         wgs84_bbox_3 = BBox(bbox=(-72.0, -70.4, -71.8, -70.2), crs=CRS.WGS84)
         wgs84_bbox_4 = BBox(bbox=(-72.0, -66.4, -71.8, -66.2), crs=CRS.WGS84)
@@ -49,10 +52,15 @@ class TestOgc(TestSentinelHub):
         resx = '53m'
         resy = '78m'
         expected_date = datetime.datetime.strptime('2017-10-07T11:20:58', '%Y-%m-%dT%H:%M:%S')
+        atmcor_url_params = {CustomUrlParam.SHOWLOGO: True,
+                             CustomUrlParam.ATMFILTER: 'ATMCOR',
+                             CustomUrlParam.QUALITY: 100,
+                             CustomUrlParam.DOWNSAMPLING: 'BICUBIC',
+                             CustomUrlParam.UPSAMPLING: 'BICUBIC'}
 
         cls.test_cases = [
             cls.OgcTestCase('generalWmsTest',
-                            OgcRequest(data_folder=cls.OUTPUT_FOLDER, image_format=MimeType.TIFF_d32f, bbox=wgs84_bbox,
+                            OgcRequest(data_folder=cls.OUTPUT_FOLDER, image_format=MimeType.TIFF_d32f, bbox=WGS84_BBOX,
                                        layer='BANDS-S2-L1C', maxcc=0.5, size_x=img_width, size_y=img_height,
                                        time=(datetime.date(year=2017, month=1, day=5),
                                              datetime.date(year=2017, month=12, day=16)),
@@ -60,7 +68,7 @@ class TestOgc(TestSentinelHub):
                             result_len=14, img_min=0.0, img_max=1.5964, img_mean=0.1810, img_median=0.1140, tile_num=29,
                             save_data=True, data_filter=[0, -2, 0]),
             cls.OgcTestCase('generalWcsTest',
-                            OgcRequest(data_folder=cls.OUTPUT_FOLDER, image_format=MimeType.TIFF_d32f, bbox=wgs84_bbox,
+                            OgcRequest(data_folder=cls.OUTPUT_FOLDER, image_format=MimeType.TIFF_d32f, bbox=WGS84_BBOX,
                                        layer='BANDS-S2-L1C', maxcc=0.6, size_x=resx, size_y=resy,
                                        time=(datetime.datetime(year=2017, month=10, day=7, hour=1),
                                              datetime.datetime(year=2017, month=12, day=11)),
@@ -70,18 +78,16 @@ class TestOgc(TestSentinelHub):
             # CustomUrlParam tests:
             cls.OgcTestCase('customUrlAtmcorQualitySampling',
                             WmsRequest(data_folder=cls.OUTPUT_FOLDER, image_format=MimeType.PNG,
-                                       layer='TRUE-COLOR-S2-L1C', width=img_width, bbox=wgs84_bbox,
+                                       layer='TRUE-COLOR-S2-L1C', width=img_width, bbox=WGS84_BBOX,
                                        time=('2017-10-01', '2017-10-02'),
-                                       custom_url_params={CustomUrlParam.SHOWLOGO: True,
-                                                          CustomUrlParam.ATMFILTER: 'ATMCOR',
-                                                          CustomUrlParam.QUALITY: 100,
-                                                          CustomUrlParam.DOWNSAMPLING: 'BICUBIC',
-                                                          CustomUrlParam.UPSAMPLING: 'BICUBIC'}),
+                                       custom_url_params=atmcor_url_params),
                             result_len=1, img_min=12, img_max=255, img_mean=194.247556, img_median=206, tile_num=2,
-                            data_filter=[0, -1]),
+                            data_filter=[0, -1],
+                            url_check=['{}={}'.format(param.value, value) for param, value in
+                                       atmcor_url_params.items() if param is not CustomUrlParam.SHOWLOGO]),
             cls.OgcTestCase('customUrlPreview',
                             WmsRequest(data_folder=cls.OUTPUT_FOLDER, image_format=MimeType.PNG,
-                                       layer='TRUE-COLOR-S2-L1C', height=img_height, bbox=wgs84_bbox,
+                                       layer='TRUE-COLOR-S2-L1C', height=img_height, bbox=WGS84_BBOX,
                                        time=('2017-10-01', '2017-10-02'),
                                        custom_url_params={CustomUrlParam.SHOWLOGO: True,
                                                           CustomUrlParam.PREVIEW: 2}),
@@ -98,7 +104,7 @@ class TestOgc(TestSentinelHub):
                             result_len=1, img_min=42, img_max=255, img_mean=230.7199, img_median=255, tile_num=3),
             cls.OgcTestCase('customUrlEvalscript,Transparent,Geometry',
                             WcsRequest(data_folder=cls.OUTPUT_FOLDER, image_format=MimeType.PNG,
-                                       layer='TRUE-COLOR-S2-L1C', resx=resx, resy=resy, bbox=wgs84_bbox,
+                                       layer='TRUE-COLOR-S2-L1C', resx=resx, resy=resy, bbox=WGS84_BBOX,
                                        time=('2017-10-01', '2017-10-02'),
                                        custom_url_params={CustomUrlParam.SHOWLOGO: True,
                                                           CustomUrlParam.TRANSPARENT: True,
@@ -118,39 +124,39 @@ class TestOgc(TestSentinelHub):
             cls.OgcTestCase('S2 L1C Test',
                             WmsRequest(data_source=DataSource.SENTINEL2_L1C, data_folder=cls.OUTPUT_FOLDER,
                                        image_format=MimeType.TIFF_d8, layer='BANDS-S2-L1C',
-                                       width=img_width, height=img_height, bbox=wgs84_bbox,
+                                       width=img_width, height=img_height, bbox=WGS84_BBOX,
                                        time=('2017-10-01', '2017-10-02')),
                             result_len=1, img_min=0, img_max=160, img_mean=60.50514, img_median=63.0,
                             tile_num=2),
             cls.OgcTestCase('S2 L2A Test',
                             WmsRequest(data_source=DataSource.SENTINEL2_L2A, data_folder=cls.OUTPUT_FOLDER,
                                        image_format=MimeType.TIFF, layer='BANDS-S2-L2A',
-                                       width=img_width, height=img_height, bbox=wgs84_bbox,
+                                       width=img_width, height=img_height, bbox=WGS84_BBOX,
                                        time=('2017-10-01', '2017-10-02')),
                             result_len=1, img_min=0.0, img_max=MimeType.TIFF.get_expected_max_value(),
                             img_mean=22744.01498, img_median=21391.0, tile_num=2),
             cls.OgcTestCase('L8 Test',
                             WmsRequest(data_source=DataSource.LANDSAT8, data_folder=cls.OUTPUT_FOLDER,
                                        image_format=MimeType.TIFF_d32f, layer='BANDS-L8',
-                                       width=img_width, height=img_height, bbox=wgs84_bbox,
+                                       width=img_width, height=img_height, bbox=WGS84_BBOX,
                                        time=('2017-10-05', '2017-10-10'), time_difference=datetime.timedelta(hours=1)),
                             result_len=1, img_min=0.0011, img_max=285.72415, img_mean=52.06075, img_median=0.5192,
                             tile_num=2),
             cls.OgcTestCase('DEM Test',
                             WmsRequest(data_source=DataSource.DEM, data_folder=cls.OUTPUT_FOLDER,
                                        image_format=MimeType.TIFF_d32f, layer='DEM',
-                                       width=img_width, height=img_height, bbox=wgs84_bbox),
+                                       width=img_width, height=img_height, bbox=WGS84_BBOX),
                             result_len=1, img_min=-108.0, img_max=-18.0, img_mean=-72.2097, img_median=-72.0),
             cls.OgcTestCase('MODIS Test',
                             WmsRequest(data_source=DataSource.MODIS, data_folder=cls.OUTPUT_FOLDER,
                                        image_format=MimeType.TIFF_d32f, layer='BANDS-MODIS',
-                                       width=img_width, height=img_height, bbox=wgs84_bbox, time='2017-10-01'),
+                                       width=img_width, height=img_height, bbox=WGS84_BBOX, time='2017-10-01'),
                             result_len=1, img_min=0.0, img_max=3.2767, img_mean=0.136548, img_median=0.00240,
                             tile_num=1),
             cls.OgcTestCase('S1 IW Test',
                             WmsRequest(data_source=DataSource.SENTINEL1_IW, data_folder=cls.OUTPUT_FOLDER,
                                        image_format=MimeType.TIFF_d32f, layer='BANDS-S1-IW',
-                                       width=img_width, height=img_height, bbox=wgs84_bbox,
+                                       width=img_width, height=img_height, bbox=WGS84_BBOX,
                                        time=('2017-10-01', '2017-10-02'),
                                        time_difference=datetime.timedelta(hours=1)),
                             result_len=1, img_min=0.0013400, img_max=MimeType.TIFF_d32f.get_expected_max_value(),
@@ -174,7 +180,7 @@ class TestOgc(TestSentinelHub):
             cls.OgcTestCase('S1 IW ASC Test',
                             WmsRequest(data_source=DataSource.SENTINEL1_IW_ASC, data_folder=cls.OUTPUT_FOLDER,
                                        image_format=MimeType.TIFF_d32f, layer='BANDS-S1-IW',
-                                       width=img_width, height=img_height, bbox=wgs84_bbox,
+                                       width=img_width, height=img_height, bbox=WGS84_BBOX,
                                        time=('2017-10-01', '2017-10-03'),
                                        time_difference=datetime.timedelta(hours=1)),
                             result_len=1, img_min=0.0013400, img_max=MimeType.TIFF_d32f.get_expected_max_value(),
@@ -199,7 +205,7 @@ class TestOgc(TestSentinelHub):
             cls.OgcTestCase('S1 IW DES Test',
                             WmsRequest(data_source=DataSource.SENTINEL1_IW_DES, data_folder=cls.OUTPUT_FOLDER,
                                        image_format=MimeType.TIFF_d32f, layer='BANDS-S1-IW',
-                                       width=img_width, height=img_height, bbox=wgs84_bbox,
+                                       width=img_width, height=img_height, bbox=WGS84_BBOX,
                                        time=('2017-10-01', '2017-10-05'),
                                        time_difference=datetime.timedelta(hours=1)),
                             result_len=1, img_min=0.0, img_max=0.0768,
@@ -235,7 +241,7 @@ class TestOgc(TestSentinelHub):
             cls.OgcTestCase('EOCloud S1 IW Test',
                             WmsRequest(data_source=DataSource.SENTINEL1_IW, data_folder=cls.OUTPUT_FOLDER,
                                        image_format=MimeType.TIFF_d32f, layer='BANDS_S1_IW',
-                                       width=img_width, height=img_height, bbox=wgs84_bbox,
+                                       width=img_width, height=img_height, bbox=WGS84_BBOX,
                                        time=('2017-10-01', '2017-10-02'),
                                        time_difference=datetime.timedelta(hours=1)),
                             result_len=1, img_min=0.0, img_max=0.49706, img_mean=0.04082, img_median=0.00607,
@@ -243,8 +249,11 @@ class TestOgc(TestSentinelHub):
         ])
         """
 
-        for test_case in cls.test_cases:
-            test_case.collect_data()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            collect_list = [executor.submit(test_case.collect_data) for test_case in cls.test_cases]
+
+        for future in collect_list:
+            future.result()
 
     def test_return_type(self):
         for test_case in self.test_cases:
@@ -266,10 +275,11 @@ class TestOgc(TestSentinelHub):
     def test_download_url(self):
         for test_case in self.test_cases:
             if test_case.url_check is not None:
-                with self.subTest(msg='Test case {}'.format(test_case.name)):
-                    download_url = self.request.get_url_list()[0]
-                    self.assertTrue(test_case.url_check in download_url,
-                                    "Parameter '{}' not in download url {}.".format(test_case.url_check, download_url))
+                download_url = test_case.request.get_url_list()[0]
+                for url_param in test_case.url_check:
+                    with self.subTest(msg='Test case {}, parameter {}'.format(test_case.name, url_param)):
+                        self.assertTrue(url_param in download_url,
+                                        "Parameter '{}' not in download url {}.".format(url_param, download_url))
 
     def test_get_dates(self):
         for test_case in self.test_cases:
@@ -299,8 +309,7 @@ class TestOgc(TestSentinelHub):
                                  test_name=test_case.name)
 
     def test_to_large_request(self):
-        bbox = BBox((-5.23, 48.0, -5.03, 48.17), CRS.WGS84)
-        request = WmsRequest(layer='TRUE-COLOR-S2-L1C', height=6000, width=6000, bbox=bbox,
+        request = WmsRequest(layer='TRUE-COLOR-S2-L1C', height=6000, width=6000, bbox=WGS84_BBOX,
                              time=('2017-10-01', '2017-10-02'))
 
         with self.assertRaises(DownloadFailedException):
@@ -313,16 +322,15 @@ class TestWebFeatureService(TestSentinelHub):
     def setUpClass(cls):
         super().setUpClass()
 
-        wgs84_bbox = BBox(bbox=(-5.23, 48.0, -5.03, 48.17), crs=CRS.WGS84)
         time_interval = (datetime.date(year=2017, month=1, day=5), datetime.date(year=2017, month=12, day=16))
 
         cls.test_cases = [
             TestCaseContainer('General test',
-                              WebFeatureService(wgs84_bbox, time_interval, data_source=DataSource.SENTINEL2_L1C,
+                              WebFeatureService(WGS84_BBOX, time_interval, data_source=DataSource.SENTINEL2_L1C,
                                                 maxcc=0.1),
                               result_len=13),
             TestCaseContainer('Latest date only',
-                              WebFeatureService(wgs84_bbox, 'latest', data_source=DataSource.SENTINEL2_L2A),
+                              WebFeatureService(WGS84_BBOX, 'latest', data_source=DataSource.SENTINEL2_L2A),
                               result_len=1),
         ]
 